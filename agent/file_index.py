@@ -0,0 +1,71 @@
+import mmap
+import pathlib
+from array import array
+from typing import Optional
+
+# Files with more lines than this are shown one page at a time
+PAGE_LINES = 500
+
+# A page never renders more than this many bytes (e.g. a minified single-line bundle)
+PAGE_BYTES = 256 * 1024
+
+LANGUAGES = {'.py': 'python', '.js': 'javascript', '.jsx': 'javascript', '.ts': 'typescript', '.tsx': 'typescript',
+             '.html': 'html', '.css': 'css', '.json': 'json', '.md': 'markdown', '.yml': 'yaml', '.yaml': 'yaml'}
+
+
+def language_for(path: str) -> str:
+    """Returns the syntax highlighting language for a file path."""
+    return LANGUAGES.get(pathlib.PurePosixPath(path).suffix, 'text')
+
+
+def build_tree(paths) -> dict[str, list[str]]:
+    """Groups project-relative file paths by directory ("" is the project root)."""
+    tree: dict[str, list[str]] = {}
+    for path in sorted(paths):
+        parent = pathlib.PurePosixPath(path).parent.as_posix()
+        tree.setdefault("" if parent == "." else parent, []).append(path)
+    return dict(sorted(tree.items()))
+
+
+def line_offsets(path: pathlib.Path) -> array:
+    """Returns the byte offset at which each line of a file starts, scanning it via mmap."""
+    offsets = array("Q", [0])
+    size = path.stat().st_size
+    if size == 0:
+        return offsets
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = mm.find(b"\n")
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = mm.find(b"\n", pos + 1)
+    # Drop the empty "line" after a trailing newline
+    if offsets[-1] == size and len(offsets) > 1:
+        offsets.pop()
+    return offsets
+
+
+def read_lines(path: pathlib.Path, offsets: array, start: int, stop: Optional[int] = None,
+               max_bytes: Optional[int] = None) -> tuple[str, bool]:
+    """Reads lines [start, stop) of a file without loading the rest of it.
+
+    Returns the text and whether it was cut off at max_bytes.
+    """
+    stop = len(offsets) if stop is None else min(stop, len(offsets))
+    if start >= stop:
+        return "", False
+    begin = offsets[start]
+    size = path.stat().st_size
+    end = offsets[stop] if stop < len(offsets) else size
+    if begin >= size:
+        return "", False
+    truncated = max_bytes is not None and end - begin > max_bytes
+    if truncated:
+        end = begin + max_bytes
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[begin:end].decode("utf-8", errors="ignore").removesuffix("\n"), truncated
+
+
+def render_page(path: pathlib.Path, offsets: array, page: int) -> tuple[str, bool]:
+    """Returns the text of one PAGE_LINES page, capped at PAGE_BYTES, and whether it was cut off."""
+    start = page * PAGE_LINES
+    return read_lines(path, offsets, start, start + PAGE_LINES, max_bytes=PAGE_BYTES)
@@ -1,30 +1,34 @@
+import json
 import os
-from dotenv import load_dotenv
+import queue
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
 import logging
 
-from langchain_groq.chat_models import ChatGroq
-from langgraph.constants import END
-from langgraph.graph import StateGraph
-
-from agent.prompts import planner_prompt, architect_prompt, coder_system_prompt
-from agent.states import Plan, TaskPlan, CoderState
+from agent.prompts import planner_prompt, architect_prompt, architect_json_prompt, coder_system_prompt
+from agent.states import Plan, TaskPlan, ImplementationTask, CoderState
 from agent.tools import write_file, read_file, get_current_directory, list_files
 
-# Load environment variables
-_ = load_dotenv()
-
-# Configure standard logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize LLM
-llm = ChatGroq(model="openai/gpt-oss-120b")
+
+@lru_cache(maxsize=None)
+def get_llm():
+    """Returns the process-wide LLM client, creating it on first use."""
+    from dotenv import load_dotenv
+    from langchain_groq.chat_models import ChatGroq
+
+    # Load environment variables
+    _ = load_dotenv()
+    return ChatGroq(model="openai/gpt-oss-120b")
 
 
 def planner_agent(state: dict) -> dict:
     """Converts user prompt into a structured Plan."""
     user_prompt = state["user_prompt"]
-    resp = llm.with_structured_output(Plan).invoke(
+    resp = get_llm().with_structured_output(Plan).invoke(
         planner_prompt(user_prompt)
     )
     if resp is None:
@@ -36,7 +40,7 @@ def planner_agent(state: dict) -> dict:
 def architect_agent(state: dict) -> dict:
     """Creates TaskPlan from Plan."""
     plan: Plan = state["plan"]
-    resp = llm.with_structured_output(TaskPlan).invoke(
+    resp = get_llm().with_structured_output(TaskPlan).invoke(
         architect_prompt(plan=plan.model_dump_json())
     )
     if resp is None:
@@ -47,18 +51,32 @@ def architect_agent(state: dict) -> dict:
     return {"task_plan": resp}
 
 
-def coder_agent(state: dict) -> dict:
-    """Direct code generation agent without using create_react_agent."""
-    coder_state: CoderState = state.get("coder_state")
-    if coder_state is None:
-        coder_state = CoderState(task_plan=state["task_plan"], current_step_idx=0)
+def stream_architect_tasks(plan: Plan, on_task) -> TaskPlan:
+    """Streams the architect's TaskPlan, passing each ImplementationTask to on_task as soon as it is complete."""
+    schema = TaskPlan.model_json_schema()
+    # JSON mode streams the answer as content tokens; Groq sends function-calling
+    # arguments in a single chunk, which would leave nothing to pipeline
+    structured_llm = get_llm().with_structured_output(schema, method="json_mode")
+    prompt = architect_json_prompt(plan=plan.model_dump_json(), schema=json.dumps(schema))
+    emitted = 0
+    partial = None
+    for partial in structured_llm.stream(prompt):
+        steps = (partial or {}).get("implementation_steps") or []
+        # Every step except the last is closed; the last may still be streaming
+        while emitted < len(steps) - 1:
+            on_task(ImplementationTask.model_validate(steps[emitted]))
+            emitted += 1
 
-    steps = coder_state.task_plan.implementation_steps
-    if coder_state.current_step_idx >= len(steps):
-        return {"coder_state": coder_state, "status": "DONE"}
+    if partial is None:
+        raise ValueError("Architect did not return a valid response.")
+    task_plan = TaskPlan.model_validate(partial)
+    for task in task_plan.implementation_steps[emitted:]:
+        on_task(task)
+    return task_plan
 
-    current_task = steps[coder_state.current_step_idx]
-    
+
+def implement_task(current_task: ImplementationTask, step_idx: int) -> None:
+    """Generates and writes the file content for a single implementation task."""
     # Read existing file content
     try:
         existing_content = read_file.invoke({"path": current_task.filepath})
@@ -100,7 +118,7 @@ Generate the complete file content now:
 
     try:
         # Use the LLM directly to generate code
-        response = llm.invoke([
+        response = get_llm().invoke([
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ])
@@ -124,7 +142,7 @@ Generate the complete file content now:
             "content": generated_content
         })
         
-        logger.info(f"Coder agent completed step {coder_state.current_step_idx}: {write_result}")
+        logger.info(f"Coder agent completed step {step_idx}: {write_result}")
         
     except Exception as e:
         logger.error(f"Error in coder agent for {current_task.filepath}: {e}")
@@ -144,32 +162,133 @@ Generate the complete file content now:
         except Exception as write_error:
             logger.error(f"Could not write placeholder file: {write_error}")
 
+
+def coder_agent(state: dict) -> dict:
+    """Direct code generation agent without using create_react_agent."""
+    coder_state: CoderState = state.get("coder_state")
+    if coder_state is None:
+        coder_state = CoderState(task_plan=state["task_plan"], current_step_idx=0)
+
+    steps = coder_state.task_plan.implementation_steps
+    if coder_state.current_step_idx >= len(steps):
+        return {"coder_state": coder_state, "status": "DONE"}
+
+    implement_task(steps[coder_state.current_step_idx], coder_state.current_step_idx)
+
     coder_state.current_step_idx += 1
     return {"coder_state": coder_state}
 
 
-# Build the agent graph
-graph = StateGraph(dict)
-graph.add_node("planner", planner_agent)
-graph.add_node("architect", architect_agent)
-graph.add_node("coder", coder_agent)
+def pipelined_architect_coder_agent(state: dict) -> dict:
+    """Runs the coder on tasks while the architect's TaskPlan is still streaming.
+
+    Steps are implemented in plan order (the architect orders tasks so that
+    dependencies come first), so the files written match the sequential run.
+    """
+    plan: Plan = state["plan"]
+    tasks: queue.Queue = queue.Queue()
+    outcome = {}
+    start = time.perf_counter()
+
+    def produce():
+        try:
+            outcome["task_plan"] = stream_architect_tasks(plan, tasks.put)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            outcome["architect_seconds"] = time.perf_counter() - start
+            tasks.put(None)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    step_idx = 0
+    while (task := tasks.get()) is not None:
+        if step_idx == 0:
+            logger.info(f"First task available after {time.perf_counter() - start:.2f}s")
+        implement_task(task, step_idx)
+        step_idx += 1
+    producer.join()
+
+    if "error" in outcome:
+        raise outcome["error"]
+
+    task_plan: TaskPlan = outcome["task_plan"]
+    task_plan.plan = plan
+    logger.info(f"Architect generated task plan: {task_plan.model_dump_json()}")
+    logger.info(
+        f"Pipelined architect+coder finished {step_idx} steps in {time.perf_counter() - start:.2f}s "
+        f"(architect streaming took {outcome['architect_seconds']:.2f}s)"
+    )
+    coder_state = CoderState(task_plan=task_plan, current_step_idx=step_idx)
+    # Same final state as the sequential graph, where each node's return replaces the state
+    return {"coder_state": coder_state, "status": "DONE"}
+
+
+def result_plan(result: dict) -> Optional[Plan]:
+    """Returns the Plan of a finished run, or None.
+
+    Each node's return replaces the graph state, so the final result only holds
+    coder_state; the plan travels on its TaskPlan in both graph modes.
+    """
+    coder_state = result.get("coder_state")
+    if coder_state is None:
+        return None
+    return getattr(coder_state.task_plan, "plan", None)
+
+
+def get_agent(pipelined: bool = False):
+    """Returns the process-wide compiled agent graph, building it on first use.
+
+    With pipelined=True the coder starts while the architect is still streaming.
+    """
+    # Positional/keyword/default calls must share one cache entry
+    return _build_agent(bool(pipelined))
+
+
+@lru_cache(maxsize=None)
+def _build_agent(pipelined: bool):
+    from langgraph.constants import END
+    from langgraph.graph import StateGraph
+
+    graph = StateGraph(dict)
+    graph.add_node("planner", planner_agent)
+    graph.set_entry_point("planner")
+
+    if pipelined:
+        graph.add_node("architect_coder", pipelined_architect_coder_agent)
+        graph.add_edge("planner", "architect_coder")
+        graph.add_edge("architect_coder", END)
+        return graph.compile()
+
+    graph.add_node("architect", architect_agent)
+    graph.add_node("coder", coder_agent)
+    graph.add_edge("planner", "architect")
+    graph.add_edge("architect", "coder")
+    graph.add_conditional_edges(
+        "coder",
+        lambda s: "END" if s.get("status") == "DONE" else "coder",
+        {"END": END, "coder": "coder"}
+    )
+    return graph.compile()
 
-graph.add_edge("planner", "architect")
-graph.add_edge("architect", "coder")
-graph.add_conditional_edges(
-    "coder",
-    lambda s: "END" if s.get("status") == "DONE" else "coder",
-    {"END": END, "coder": "coder"}
-)
 
-graph.set_entry_point("planner")
-agent = graph.compile()
+def __getattr__(name: str):
+    # Keep `from agent.graph import agent` working without building anything at import time
+    if name == "agent":
+        return get_agent()
+    if name == "pipelined_agent":
+        return get_agent(pipelined=True)
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Quick test when running standalone
 if __name__ == "__main__":
-    result = agent.invoke(
+    logging.basicConfig(level=logging.INFO)
+    result = get_agent().invoke(
         {"user_prompt": "Build a colourful modern todo app in html css and js"},
         {"recursion_limit": 100}
     )
-    print("Final State:", result)
\ No newline at end of file
+    print("Final State:", result)
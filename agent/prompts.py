@@ -28,6 +28,14 @@ Project Plan:
     return ARCHITECT_PROMPT
 
 
+def architect_json_prompt(plan: str, schema: str) -> str:
+    ARCHITECT_JSON_PROMPT = architect_prompt(plan) + f"""
+Respond ONLY with a JSON object that matches this JSON schema, with no other text:
+{schema}
+    """
+    return ARCHITECT_JSON_PROMPT
+
+
 def coder_system_prompt() -> str:
     CODER_SYSTEM_PROMPT = """
 You are the CODER agent.
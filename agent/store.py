@@ -0,0 +1,203 @@
+import hashlib
+import os
+import pathlib
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Optional
+
+STORE_PATH = pathlib.Path.cwd() / ".app_builder" / "projects.db"
+
+# Bodies smaller than this are stored raw; compressing them rarely pays off.
+COMPRESS_MIN_SIZE = 512
+
+# Uncompressed on-disk blob copies are evicted, least recently used first, above this size.
+BLOB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    compressed INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS manifest (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    hash TEXT NOT NULL REFERENCES blobs(hash),
+    PRIMARY KEY (project_id, path)
+);
+"""
+
+
+def content_hash(data: bytes) -> str:
+    """Returns the content address (sha256 hex digest) of a file body."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ProjectStore:
+    """SQLite-backed store of generated projects.
+
+    File bodies are kept once per distinct content as (optionally zlib-compressed)
+    blobs; each project run only records a manifest of path -> content hash.
+    """
+
+    def __init__(self, db_path: pathlib.Path = STORE_PATH, compress: bool = True,
+                 blob_cache_max_bytes: int = BLOB_CACHE_MAX_BYTES):
+        self.db_path = pathlib.Path(db_path)
+        self.compress = compress
+        self.blob_cache_max_bytes = blob_cache_max_bytes
+        self.blob_dir = self.db_path.parent / "blobs"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _insert_blob(self, data: bytes) -> str:
+        # Caller must hold the lock and an open transaction
+        digest = content_hash(data)
+        compressed = self.compress and len(data) >= COMPRESS_MIN_SIZE
+        payload = zlib.compress(data) if compressed else data
+        self._conn.execute(
+            "INSERT OR IGNORE INTO blobs (hash, size, compressed, data) VALUES (?, ?, ?, ?)",
+            (digest, len(data), int(compressed), payload),
+        )
+        return digest
+
+    def put_blob(self, data: bytes) -> str:
+        """Stores a file body if it is not already present and returns its hash."""
+        with self._lock, self._conn:
+            return self._insert_blob(data)
+
+    def get_blob(self, digest: str) -> Optional[bytes]:
+        """Returns the raw file body stored under the given hash, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT compressed, data FROM blobs WHERE hash = ?", (digest,)
+            ).fetchone()
+        if row is None:
+            return None
+        compressed, payload = row
+        return zlib.decompress(payload) if compressed else bytes(payload)
+
+    def get_text(self, digest: str) -> str:
+        """Returns a stored file body decoded as UTF-8."""
+        data = self.get_blob(digest)
+        if data is None:
+            return "File not found"
+        return data.decode("utf-8", errors="ignore")
+
+    def blob_path(self, digest: str) -> Optional[pathlib.Path]:
+        """Returns an on-disk, uncompressed copy of a blob, writing it on first request.
+
+        The file is named by its hash, so it can be memory-mapped without loading the
+        body into memory again. Copies are a bounded cache (see evict_blob_cache) and
+        None is returned if the hash is not stored.
+        """
+        path = self.blob_dir / digest
+        if path.exists():
+            # mtime doubles as the last-used time for eviction
+            os.utime(path)
+            return path
+        data = self.get_blob(digest)
+        if data is None:
+            return None
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        self.evict_blob_cache(keep=digest)
+        return path
+
+    def evict_blob_cache(self, keep: Optional[str] = None) -> None:
+        """Deletes least recently used blob copies until the cache fits its size limit."""
+        if not self.blob_dir.exists():
+            return
+        entries = []
+        for p in self.blob_dir.iterdir():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.blob_cache_max_bytes:
+                break
+            if p.name == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def save_project(self, name: str, project_dir: pathlib.Path) -> int:
+        """Snapshots every file under project_dir into a new project run and returns its id."""
+        project_dir = pathlib.Path(project_dir)
+        files = []
+        if project_dir.exists():
+            files = [f for f in sorted(project_dir.rglob("*")) if f.is_file()]
+
+        # Blobs and manifest go in one transaction so a concurrent delete_project
+        # cannot garbage-collect a blob before the manifest references it
+        with self._lock, self._conn:
+            entries = [
+                (f.relative_to(project_dir).as_posix(), self._insert_blob(f.read_bytes()))
+                for f in files
+            ]
+            cur = self._conn.execute(
+                "INSERT INTO projects (name, created_at) VALUES (?, ?)",
+                (name, datetime.now().isoformat(timespec="seconds")),
+            )
+            project_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO manifest (project_id, path, hash) VALUES (?, ?, ?)",
+                [(project_id, path, digest) for path, digest in entries],
+            )
+        return project_id
+
+    def manifest(self, project_id: int) -> dict[str, str]:
+        """Returns the path -> content hash mapping of a project run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, hash FROM manifest WHERE project_id = ? ORDER BY path",
+                (project_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def list_projects(self) -> list[dict]:
+        """Returns metadata for all stored project runs, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, created_at FROM projects ORDER BY id DESC"
+            ).fetchall()
+        return [
+            {"id": pid, "name": name, "timestamp": datetime.fromisoformat(created)}
+            for pid, name, created in rows
+        ]
+
+    def count_projects(self) -> int:
+        """Returns the number of stored project runs."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def delete_project(self, project_id: int) -> None:
+        """Removes a project run and garbage-collects blobs no manifest references."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            orphans = [row[0] for row in self._conn.execute(
+                "SELECT hash FROM blobs WHERE hash NOT IN (SELECT DISTINCT hash FROM manifest)"
+            )]
+            self._conn.executemany("DELETE FROM blobs WHERE hash = ?", [(h,) for h in orphans])
+        for digest in orphans:
+            (self.blob_dir / digest).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
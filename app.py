@@ -2,7 +2,9 @@ import streamlit as st
 import streamlit.components.v1 as components
 from pathlib import Path
 import time
+import io
 import json
+import logging
 import sys
 import os
 from datetime import datetime
@@ -22,15 +24,14 @@ if not GROQ_API_KEY:
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agent.graph import agent
+from agent.graph import get_agent, result_plan
 from agent.states import Plan, TaskPlan
+from agent.store import ProjectStore
+from agent.file_index import PAGE_BYTES, PAGE_LINES, build_tree, language_for, line_offsets, render_page
 import threading
 import queue
 
-# Import ChatGroq and pass the API key
-from langchain_groq.chat_models import ChatGroq
-
-llm = ChatGroq(model="openai/gpt-oss-120b", api_key=GROQ_API_KEY)
+logging.basicConfig(level=logging.INFO)
 
 # Page configuration
 st.set_page_config(
@@ -159,18 +160,44 @@ st.markdown("""
 
 # Initialize session state
 if 'messages' not in st.session_state: st.session_state.messages = []
-if 'projects' not in st.session_state: st.session_state.projects = []
 if 'current_project' not in st.session_state: st.session_state.current_project = None
 if 'generation_status' not in st.session_state: st.session_state.generation_status = None
+# Only path -> content hash; file bodies live in the project store and are loaded on demand
 if 'generated_files' not in st.session_state: st.session_state.generated_files = {}
+if 'download_ready' not in st.session_state: st.session_state.download_ready = None
+if 'project_zip' not in st.session_state: st.session_state.project_zip = None
 
 # --- Helper functions ---
+@st.cache_resource
+def get_store():
+    return ProjectStore()
+
+@st.cache_resource
+def get_cached_agent():
+    # The graph and its ChatGroq client are built once per process, not on every rerun
+    return get_agent()
+
+@st.cache_data(max_entries=256)
+def get_line_offsets(digest):
+    path = get_store().blob_path(digest)
+    return line_offsets(path) if path else None
+
+@st.cache_data(max_entries=64)
+def get_page(digest, page):
+    # Keyed by content hash, so identical files across projects share cached pages
+    path, offsets = get_store().blob_path(digest), get_line_offsets(digest)
+    if path is None or offsets is None: return "File not found", False
+    return render_page(path, offsets, page)
+
+def set_download_ready(digest):
+    st.session_state.download_ready = digest
+
 def clean_generated_files():
     project_dir = Path.cwd() / "generated_project"
     if project_dir.exists(): shutil.rmtree(project_dir)
     project_dir.mkdir(exist_ok=True)
 
-def run_agent_async(prompt, result_queue):
+def run_agent_async(agent, prompt, result_queue):
     try:
         result = agent.invoke({"user_prompt": prompt}, {"recursion_limit": 50})
         result_queue.put(("success", result))
@@ -190,7 +217,8 @@ def get_file_content(filepath):
 
 def create_preview_html(files):
     if not files: return "<p>No files to preview</p>"
-    web_files = {k: v for k, v in files.items() if k.endswith(('.html', '.css', '.js', '.jsx', '.tsx'))}
+    store = get_store()
+    web_files = {k: store.get_text(h) for k, h in files.items() if k.endswith(('.html', '.css', '.js', '.jsx', '.tsx'))}
     if not web_files: return "<p>No web files to preview. Check the file explorer for generated files.</p>"
     html_files = [f for f in web_files.keys() if f.endswith('.html')]
     if html_files:
@@ -201,18 +229,34 @@ def create_preview_html(files):
         return main_html
     return "<p>Preview not available for this project type</p>"
 
-def export_project():
-    project_dir = Path.cwd() / "generated_project"
-    if not project_dir.exists(): return None
+def export_project(files):
+    # Built in memory from the store so reopened projects export their own files
+    store = get_store()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for path, digest in files.items():
+            data = store.get_blob(digest)
+            if data is not None: zipf.writestr(path, data)
+    return buffer.getvalue()
+
+def prepare_project_zip():
+    # Only built on request, and kept per project so reruns don't rebuild it
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    zip_filename = f"devstream_project_{timestamp}.zip"
-    with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(project_dir):
-            for file in files:
-                file_path = Path(root) / file
-                arcname = file_path.relative_to(project_dir)
-                zipf.write(file_path, arcname)
-    return zip_filename
+    st.session_state.project_zip = (st.session_state.current_project, f"devstream_project_{timestamp}.zip",
+                                    export_project(st.session_state.generated_files))
+
+def clear_project_zip():
+    st.session_state.project_zip = None
+
+def open_project(project_id):
+    st.session_state.current_project = project_id
+    st.session_state.generated_files = get_store().manifest(project_id)
+
+def delete_project(project_id):
+    get_store().delete_project(project_id)
+    if st.session_state.current_project == project_id:
+        st.session_state.current_project = None
+        st.session_state.generated_files = {}
 
 # --- Main App ---
 def main():
@@ -237,25 +281,40 @@ def main():
                     ("📦", "Export Ready", "Download & Deploy"),
                     ("🔄", "Multi-Agent", "Intelligent Workflow"),
                     ("💻", "Full Stack", "Complete Applications")]
-        for icon, title, desc in features:
-            st.markdown(f"<div class='feature-card'><div style='font-size:2rem;'>{icon}</div><div style='font-weight:600;margin-top:0.5rem'>{title}</div><div style='font-size:0.85rem;color:#666'>{desc}</div></div>", unsafe_allow_html=True)
-            st.markdown("")
+        # One element for all cards keeps per-rerun rendering overhead down
+        st.markdown("".join(f"<div class='feature-card' style='margin-bottom:1rem'><div style='font-size:2rem;'>{icon}</div><div style='font-weight:600;margin-top:0.5rem'>{title}</div><div style='font-size:0.85rem;color:#666'>{desc}</div></div>" for icon, title, desc in features), unsafe_allow_html=True)
         st.markdown("---")
         st.markdown("### 📊 Statistics")
         col1, col2 = st.columns(2)
-        with col1: st.metric("Projects", len(st.session_state.projects))
+        with col1: st.metric("Projects", get_store().count_projects())
         with col2: st.metric("Files", len(st.session_state.generated_files))
         st.markdown("---")
         st.markdown("### 🛠️ Quick Actions")
         if st.button("🗑️ Clear Workspace", use_container_width=True):
             clean_generated_files()
             st.session_state.generated_files = {}
+            st.session_state.current_project = None
             st.success("Workspace cleared!")
         if st.session_state.generated_files:
-            zip_file = export_project()
-            if zip_file:
-                with open(zip_file, "rb") as f:
-                    st.download_button("📥 Download Project", data=f.read(), file_name=zip_file, mime="application/zip", use_container_width=True)
+            project_zip = st.session_state.project_zip
+            if project_zip is None or project_zip[0] != st.session_state.current_project:
+                st.button("📦 Prepare Project Download", on_click=prepare_project_zip, use_container_width=True)
+            else:
+                _, zip_filename, zip_data = project_zip
+                st.download_button("📥 Download Project", data=zip_data, file_name=zip_filename, mime="application/zip", use_container_width=True, on_click=clear_project_zip)
+        st.markdown("---")
+        st.markdown("### 🗂️ Project History")
+        history = get_store().list_projects()
+        if history:
+            labels = {p["id"]: f"{p['name']} · {p['timestamp']:%Y-%m-%d %H:%M}" for p in history}
+            ids = list(labels.keys())
+            current = st.session_state.current_project
+            selected_id = st.selectbox("Past projects:", ids, index=ids.index(current) if current in ids else 0, format_func=labels.get)
+            col1, col2 = st.columns(2)
+            with col1: st.button("📂 Open", on_click=open_project, args=(selected_id,), use_container_width=True)
+            with col2: st.button("🗑️ Delete", on_click=delete_project, args=(selected_id,), use_container_width=True)
+        else:
+            st.caption("No saved projects yet.")
 
     # --- Tabs ---
     tab1, tab2, tab3, tab4 = st.tabs(["💬 Chat", "👁️ Live Preview", "📁 File Explorer", "📚 Documentation"])
@@ -280,7 +339,7 @@ def main():
                                    ("🔧 Implementing features...", 0.8),
                                    ("✅ Finalizing project...", 1.0)]
                 result_queue = queue.Queue()
-                thread = threading.Thread(target=run_agent_async, args=(prompt, result_queue))
+                thread = threading.Thread(target=run_agent_async, args=(get_cached_agent(), prompt, result_queue))
                 thread.start()
                 for msg, progress in status_messages:
                     status_placeholder.markdown(f'<div class="status-badge processing-badge">{msg}</div>', unsafe_allow_html=True)
@@ -291,21 +350,17 @@ def main():
                     status, result = result_queue.get()
                     if status == "success":
                         project_dir = Path.cwd() / "generated_project"
-                        generated_files = {}
-                        if project_dir.exists():
-                            for file_path in project_dir.rglob("*"):
-                                if file_path.is_file():
-                                    relative_path = file_path.relative_to(project_dir)
-                                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                        generated_files[str(relative_path)] = f.read()
+                        store = get_store()
+                        plan = result_plan(result)
+                        project_id = store.save_project(plan.name if plan else "Project", project_dir)
+                        generated_files = store.manifest(project_id)
+                        st.session_state.current_project = project_id
                         st.session_state.generated_files = generated_files
                         plan_info = "Project generated successfully!"
-                        if 'plan' in result and result['plan']:
-                            plan = result['plan']
+                        if plan:
                             plan_info = f"### ✅ Project: {plan.name}\n**Description:** {plan.description}\n**Tech Stack:** {plan.techstack}\n**Features:**\n{chr(10).join([f'- {f}' for f in plan.features])}\n**Files Generated:** {len(generated_files)}"
                         status_placeholder.markdown('<div class="status-badge success-badge">✨ Generation Complete!</div>', unsafe_allow_html=True)
                         st.markdown(plan_info)
-                        st.session_state.projects.append({"name": plan.name if 'plan' in result else "Project","timestamp": datetime.now(),"files": len(generated_files)})
                         st.session_state.messages.append({"role": "assistant","content": plan_info})
                         st.balloons()
                     else:
@@ -330,15 +385,37 @@ def main():
     with tab3:
         st.markdown("### 📁 File Explorer")
         if st.session_state.generated_files:
-            selected_file = st.selectbox("Select a file to view:", list(st.session_state.generated_files.keys()))
+            tree = build_tree(st.session_state.generated_files)
+            col1, col2 = st.columns(2)
+            with col1: folder = st.selectbox("Folder:", list(tree.keys()), format_func=lambda d: f"📁 {d or '/'}")
+            with col2: selected_file = st.selectbox("Select a file to view:", tree[folder], format_func=lambda p: Path(p).name)
             if selected_file:
                 st.markdown(f"**File:** `{selected_file}`")
-                lang_map = {'.py': 'python', '.js': 'javascript', '.jsx': 'javascript', '.ts': 'typescript', '.tsx': 'typescript',
-                            '.html': 'html', '.css': 'css', '.json': 'json', '.md': 'markdown', '.yml': 'yaml', '.yaml': 'yaml'}
-                file_ext = Path(selected_file).suffix
-                language = lang_map.get(file_ext, 'text')
-                st.code(st.session_state.generated_files[selected_file], language=language, line_numbers=True)
-                st.download_button(f"Download {selected_file}", data=st.session_state.generated_files[selected_file], file_name=selected_file, mime="text/plain")
+                digest = st.session_state.generated_files[selected_file]
+                offsets = get_line_offsets(digest)
+                if offsets is None:
+                    st.error("File not found")
+                else:
+                    total_lines = len(offsets)
+                    page = 0
+                    if total_lines > PAGE_LINES:
+                        pages = (total_lines + PAGE_LINES - 1) // PAGE_LINES
+                        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"page_{digest}") - 1
+                        st.caption(f"Lines {page * PAGE_LINES + 1}–{min((page + 1) * PAGE_LINES, total_lines)} of {total_lines}")
+                    text, truncated = get_page(digest, page)
+                    # st.code numbers from 1, so later pages rely on the caption for their range
+                    st.code(text, language=language_for(selected_file), line_numbers=total_lines <= PAGE_LINES)
+                    if truncated:
+                        st.warning(f"This page is larger than {PAGE_BYTES // 1024} KB and was cut off. Download the file to see the rest.")
+                    # download_button holds the whole body in memory, so only load it once asked for
+                    if st.session_state.download_ready != digest:
+                        st.button(f"Prepare download of {Path(selected_file).name}", on_click=set_download_ready, args=(digest,))
+                    else:
+                        data = get_store().get_blob(digest)
+                        if data is None:
+                            st.error("File not found")
+                        else:
+                            st.download_button(f"Download {selected_file}", data=data, file_name=Path(selected_file).name, mime="text/plain", on_click=set_download_ready, args=(None,))
         else:
             st.info("No files generated yet. Start by describing your project in the Chat tab! 💬")
 
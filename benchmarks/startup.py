@@ -0,0 +1,82 @@
+"""Tracks cold-start and per-rerun overhead of the agent graph and the Streamlit app.
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--reruns 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def time_subprocess(code: str, runs: int) -> list[float]:
+    """Runs code in a fresh interpreter `runs` times and returns the wall-clock seconds of each."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(f"{label:<32} median {statistics.median(timings) * 1000:8.1f} ms   "
+          f"min {min(timings) * 1000:8.1f} ms   (n={len(timings)})")
+
+
+def bench_app_reruns(reruns: int) -> None:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit not installed; skipping app rerun benchmark")
+        return
+
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    # app.py keeps its project store and generated files under the working directory
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            app = AppTest.from_file(str(ROOT / "app.py"), default_timeout=60)
+
+            start = time.perf_counter()
+            app.run()
+            report("app.py first run", [time.perf_counter() - start])
+
+            timings = []
+            for _ in range(reruns):
+                start = time.perf_counter()
+                app.run()
+                timings.append(time.perf_counter() - start)
+            report("app.py rerun", timings)
+        finally:
+            os.chdir(ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time and rerun overhead")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (default: 5)")
+    parser.add_argument("--reruns", type=int, default=5, help="Streamlit reruns to time (default: 5)")
+    args = parser.parse_args()
+
+    report("python startup", time_subprocess("pass", args.runs))
+    report("import agent.graph", time_subprocess("import agent.graph", args.runs))
+    report("import + build graph", time_subprocess(
+        "from agent.graph import get_agent; get_agent()", args.runs))
+    # Graph nodes create the client lazily, so time the langchain_groq import and ChatGroq setup separately
+    report("import + create LLM client", time_subprocess(
+        "import os; os.environ.setdefault('GROQ_API_KEY', 'benchmark')\n"
+        "from agent.graph import get_llm; get_llm()", args.runs))
+    report("import + graph + LLM client", time_subprocess(
+        "import os; os.environ.setdefault('GROQ_API_KEY', 'benchmark')\n"
+        "from agent.graph import get_agent, get_llm; get_agent(); get_llm()", args.runs))
+    bench_app_reruns(args.reruns)
+
+
+if __name__ == "__main__":
+    main()
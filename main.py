@@ -1,24 +1,32 @@
 import argparse
+import logging
 import sys
+import time
 import traceback
 
-from agent.graph import agent
+from agent.graph import get_agent
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run engineering project planner")
     parser.add_argument("--recursion-limit", "-r", type=int, default=100,
                         help="Recursion limit for processing (default: 100)")
+    parser.add_argument("--pipeline", "-p", action="store_true",
+                        help="Start coding while the architect's task plan is still streaming")
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
 
     try:
         user_prompt = input("Enter your project prompt: ")
-        result = agent.invoke(
+        runner = get_agent(pipelined=args.pipeline)
+        start = time.perf_counter()
+        result = runner.invoke(
             {"user_prompt": user_prompt},
             {"recursion_limit": args.recursion_limit}
         )
         print("Final State:", result)
+        print(f"End-to-end latency: {time.perf_counter() - start:.2f}s")
     except KeyboardInterrupt:
         print("\nOperation cancelled by user.")
         sys.exit(0)
@@ -0,0 +1,66 @@
+import pytest
+
+from agent.file_index import PAGE_BYTES, PAGE_LINES, build_tree, language_for, line_offsets, read_lines, render_page
+
+
+@pytest.fixture
+def write(tmp_path):
+    def _write(content: bytes):
+        path = tmp_path / "file.txt"
+        path.write_bytes(content)
+        return path
+    return _write
+
+
+@pytest.mark.parametrize("content, offsets, text", [
+    (b"", [0], ""),
+    (b"a", [0], "a"),
+    (b"a\n", [0], "a"),
+    (b"a\nb", [0, 2], "a\nb"),
+    (b"a\nb\n", [0, 2], "a\nb"),
+    (b"\n\n", [0, 1], "\n"),
+    ("é\nñ\n".encode("utf-8"), [0, 3], "é\nñ"),
+])
+def test_line_offsets_and_full_read(write, content, offsets, text):
+    path = write(content)
+    assert list(line_offsets(path)) == offsets
+    assert read_lines(path, line_offsets(path), 0) == (text, False)
+
+
+def test_read_line_range(write):
+    path = write("".join(f"line{i}\n" for i in range(1200)).encode())
+    offsets = line_offsets(path)
+
+    text, truncated = read_lines(path, offsets, 500, 1000)
+    lines = text.split("\n")
+    assert (lines[0], lines[-1], len(lines), truncated) == ("line500", "line999", 500, False)
+    assert read_lines(path, offsets, 1199, 5000) == ("line1199", False)
+    assert read_lines(path, offsets, 1200) == ("", False)
+
+
+def test_read_lines_byte_cap(write):
+    path = write(b"x" * 100)
+    assert read_lines(path, line_offsets(path), 0, max_bytes=10) == ("x" * 10, True)
+
+
+def test_render_page_returns_clean_page_text(write):
+    path = write("".join(f"line{i + 1}\n" for i in range(PAGE_LINES + 5)).encode())
+    text, truncated = render_page(path, line_offsets(path), 1)
+    assert text.split("\n") == [f"line{n}" for n in range(PAGE_LINES + 1, PAGE_LINES + 6)]
+    assert truncated is False
+
+
+def test_render_page_truncates_long_lines(write):
+    content = "var a=1;" * (PAGE_BYTES // 4)
+    path = write(content.encode())
+    assert render_page(path, line_offsets(path), 0) == (content[:PAGE_BYTES], True)
+
+
+def test_build_tree_and_language():
+    assert build_tree(["src/c/d.js", "a.py", "src/b.py", "z.md"]) == {
+        "": ["a.py", "z.md"],
+        "src": ["src/b.py"],
+        "src/c": ["src/c/d.js"],
+    }
+    assert language_for("src/app.tsx") == "typescript"
+    assert language_for("Makefile") == "text"
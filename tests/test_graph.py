@@ -0,0 +1,139 @@
+import threading
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain_core")
+pytest.importorskip("langgraph")
+
+from agent import graph
+from agent.states import File, Plan, TaskPlan
+
+PLAN = Plan(
+    name="Todo",
+    description="A todo app",
+    techstack="html, css, js",
+    features=["add todos"],
+    files=[File(path="index.html", purpose="markup"), File(path="app.js", purpose="logic")],
+)
+STEPS = [
+    {"filepath": "index.html", "task_description": "Create the page markup"},
+    {"filepath": "style.css", "task_description": "Style the page"},
+    {"filepath": "app.js", "task_description": "Add todo logic"},
+]
+
+
+class FakeStructuredLLM:
+    def __init__(self, schema, owner):
+        self.schema = schema
+        self.owner = owner
+
+    def invoke(self, prompt):
+        if self.schema is Plan:
+            return PLAN.model_copy(deep=True)
+        return TaskPlan.model_validate({"implementation_steps": STEPS})
+
+    def stream(self, prompt):
+        # Grow implementation_steps field by field, the way a JSON parser sees partial output
+        steps = []
+        for i, step in enumerate(STEPS):
+            steps.append({"filepath": step["filepath"]})
+            yield {"implementation_steps": [dict(s) for s in steps]}
+            if i == 1:
+                # Step 0 is closed now; the coder should finish it before the stream goes on
+                self.owner.overlapped = self.owner.first_task_done.wait(timeout=5)
+            steps[-1]["task_description"] = step["task_description"]
+            yield {"implementation_steps": [dict(s) for s in steps]}
+        self.owner.stream_finished = True
+
+
+class FakeLLM:
+    def __init__(self):
+        self.methods = []
+        self.first_task_done = threading.Event()
+        self.overlapped = False
+        self.stream_finished = False
+
+    def with_structured_output(self, schema, method="function_calling"):
+        self.methods.append(method)
+        return FakeStructuredLLM(schema, self)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeLLM()
+    monkeypatch.setattr(graph, "get_llm", lambda: llm)
+    return llm
+
+
+@pytest.fixture
+def implemented(monkeypatch, fake_llm):
+    calls = []
+
+    def fake_implement_task(task, step_idx):
+        calls.append((step_idx, task.filepath, fake_llm.stream_finished))
+        if step_idx == 0:
+            fake_llm.first_task_done.set()
+
+    monkeypatch.setattr(graph, "implement_task", fake_implement_task)
+    return calls
+
+
+def test_stream_architect_tasks_emits_in_plan_order(fake_llm):
+    emitted = []
+    task_plan = graph.stream_architect_tasks(PLAN, lambda task: (
+        emitted.append((task.filepath, fake_llm.stream_finished)),
+        fake_llm.first_task_done.set(),
+    ))
+
+    assert [filepath for filepath, _ in emitted] == [s["filepath"] for s in STEPS]
+    # Every task but the last is closed before the stream ends
+    assert [finished for _, finished in emitted] == [False, False, True]
+    assert task_plan == TaskPlan.model_validate({"implementation_steps": STEPS})
+    assert fake_llm.methods == ["json_mode"]
+
+
+def test_pipelined_coder_overlaps_architect_stream(fake_llm, implemented):
+    result = graph.pipelined_architect_coder_agent({"plan": PLAN})
+
+    assert fake_llm.overlapped
+    assert [(idx, path) for idx, path, _ in implemented] == [(i, s["filepath"]) for i, s in enumerate(STEPS)]
+    assert implemented[0][2] is False
+    assert result["status"] == "DONE"
+    assert result["coder_state"].current_step_idx == len(STEPS)
+
+
+def test_pipelined_graph_matches_sequential(fake_llm, implemented):
+    inputs = {"user_prompt": "Build a todo app"}
+
+    sequential = graph.get_agent().invoke(dict(inputs), {"recursion_limit": 20})
+    sequential_calls = [(idx, path) for idx, path, _ in implemented]
+    implemented.clear()
+    pipelined = graph.get_agent(pipelined=True).invoke(dict(inputs), {"recursion_limit": 20})
+
+    assert [(idx, path) for idx, path, _ in implemented] == sequential_calls
+    assert pipelined == sequential
+    assert pipelined["coder_state"].task_plan.plan == PLAN
+
+
+def test_get_agent_is_cached_per_mode():
+    assert graph.get_agent() is graph.get_agent(pipelined=False)
+    assert graph.get_agent(False) is graph.get_agent()
+    assert graph.get_agent(pipelined=True) is not graph.get_agent()
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_run_is_saved_under_plan_name(fake_llm, implemented, tmp_path, pipelined):
+    from agent.store import ProjectStore
+
+    result = graph.get_agent(pipelined=pipelined).invoke({"user_prompt": "Build a todo app"}, {"recursion_limit": 20})
+    plan = graph.result_plan(result)
+
+    store = ProjectStore(tmp_path / "projects.db")
+    store.save_project(plan.name if plan else "Project", tmp_path / "generated_project")
+    assert [p["name"] for p in store.list_projects()] == [PLAN.name]
+    store.close()
+
+
+def test_result_plan_without_coder_state():
+    assert graph.result_plan({"status": "DONE"}) is None
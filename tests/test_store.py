@@ -0,0 +1,142 @@
+import os
+import sqlite3
+
+import pytest
+
+from agent.store import COMPRESS_MIN_SIZE, ProjectStore, content_hash
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ProjectStore(tmp_path / "store" / "projects.db")
+    yield s
+    s.close()
+
+
+def write_project(root, files):
+    for path, content in files.items():
+        p = root / path
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(content)
+    return root
+
+
+def blob_rows(store):
+    return store._conn.execute("SELECT hash, compressed FROM blobs").fetchall()
+
+
+def test_put_blob_round_trip_and_compression(store):
+    small = b"print('hi')\n"
+    large = b"x" * (COMPRESS_MIN_SIZE * 4)
+
+    small_hash = store.put_blob(small)
+    large_hash = store.put_blob(large)
+
+    assert small_hash == content_hash(small)
+    assert store.get_blob(small_hash) == small
+    assert store.get_blob(large_hash) == large
+    assert dict(blob_rows(store)) == {small_hash: 0, large_hash: 1}
+
+
+def test_put_blob_without_compression(tmp_path):
+    store = ProjectStore(tmp_path / "projects.db", compress=False)
+    digest = store.put_blob(b"y" * (COMPRESS_MIN_SIZE * 4))
+    assert dict(blob_rows(store)) == {digest: 0}
+    store.close()
+
+
+def test_get_missing_blob(store):
+    assert store.get_blob("0" * 64) is None
+    assert store.get_text("0" * 64) == "File not found"
+
+
+def test_save_project_dedupes_identical_files(store, tmp_path):
+    root = write_project(tmp_path / "p", {
+        "index.html": b"<html></html>",
+        "copy/index.html": b"<html></html>",
+        "app.js": b"console.log(1)",
+    })
+
+    first = store.save_project("A", root)
+    second = store.save_project("B", root)
+
+    manifest = store.manifest(first)
+    assert manifest == store.manifest(second)
+    assert list(manifest) == ["app.js", "copy/index.html", "index.html"]
+    assert manifest["index.html"] == manifest["copy/index.html"]
+    assert len(blob_rows(store)) == 2
+    assert store.get_text(manifest["app.js"]) == "console.log(1)"
+
+
+def test_save_project_missing_dir(store, tmp_path):
+    project_id = store.save_project("Empty", tmp_path / "missing")
+    assert store.manifest(project_id) == {}
+
+
+def test_list_and_count_projects(store, tmp_path):
+    root = write_project(tmp_path / "p", {"a.txt": b"a"})
+    first = store.save_project("First", root)
+    second = store.save_project("Second", root)
+
+    assert store.count_projects() == 2
+    assert [(p["id"], p["name"]) for p in store.list_projects()] == [(second, "Second"), (first, "First")]
+
+
+def test_delete_project_collects_orphan_blobs(store, tmp_path):
+    shared = write_project(tmp_path / "a", {"shared.txt": b"shared", "only_a.txt": b"a"})
+    other = write_project(tmp_path / "b", {"shared.txt": b"shared"})
+    a = store.save_project("A", shared)
+    b = store.save_project("B", other)
+
+    store.delete_project(a)
+    assert store.manifest(a) == {}
+    assert {h for h, _ in blob_rows(store)} == {content_hash(b"shared")}
+
+    store.delete_project(b)
+    assert blob_rows(store) == []
+    assert store.count_projects() == 0
+
+
+def test_manifest_requires_existing_blob(store):
+    project_id = store.save_project("Empty", store.db_path.parent / "missing")
+    with pytest.raises(sqlite3.IntegrityError):
+        with store._conn:
+            store._conn.execute(
+                "INSERT INTO manifest (project_id, path, hash) VALUES (?, ?, ?)",
+                (project_id, "ghost.txt", "0" * 64),
+            )
+
+
+def test_blob_path_materializes_uncompressed_copy(store):
+    data = b"z" * (COMPRESS_MIN_SIZE * 4)
+    digest = store.put_blob(data)
+
+    path = store.blob_path(digest)
+    assert path.read_bytes() == data
+    assert store.blob_path(digest) == path
+    assert store.blob_path("0" * 64) is None
+
+
+def test_blob_cache_evicts_least_recently_used(tmp_path):
+    store = ProjectStore(tmp_path / "projects.db", blob_cache_max_bytes=250)
+    old, mid, new = (store.put_blob(bytes([i]) * 100) for i in range(3))
+
+    old_path = store.blob_path(old)
+    mid_path = store.blob_path(mid)
+    os.utime(old_path, (1, 1))
+    os.utime(mid_path, (2, 2))
+    new_path = store.blob_path(new)
+
+    assert not old_path.exists()
+    assert mid_path.exists() and new_path.exists()
+    # Evicted copies are rewritten on demand
+    assert store.blob_path(old).read_bytes() == bytes([0]) * 100
+    store.close()
+
+
+def test_delete_project_removes_blob_copies(store, tmp_path):
+    project_id = store.save_project("A", write_project(tmp_path / "p", {"a.txt": b"a"}))
+    path = store.blob_path(store.manifest(project_id)["a.txt"])
+
+    store.delete_project(project_id)
+    assert not path.exists()